@@ -20,65 +20,314 @@ import csv
 import json
 import os
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
+try:
+    # Optional C-accelerated parser; both it and json.loads accept bytes
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Default log directory (central collector)
 LOG_DIR = os.environ.get("NETDIAG_LOG_DIR", "/var/log/netdiag")
 
+# Upper bound on concurrent per-host file reads
+MAX_READ_WORKERS = 16
+
+# Read buffer for log files (1 MiB) - fewer read() syscalls on large logs
+READ_BUFFER_SIZE = 1 << 20
+
+# Chunk size for scanning log files backwards from the end
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=1)
+def find_all_hosts() -> tuple[str, ...]:
+    """
+    Find all host directories in the log directory.
+    
+    The directory is scanned once per process; later calls reuse the result.
+    """
+    if not os.path.isdir(LOG_DIR):
+        return ()
+    with os.scandir(LOG_DIR) as entries:
+        return tuple(e.name for e in entries if e.is_dir())
+
+
+@lru_cache(maxsize=65536)
+def parse_ts(ts: str) -> datetime:
+    """Parse an ISO-8601 log timestamp; repeated strings hit the cache."""
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+def is_full_ts(ts: str) -> bool:
+    """True if ts is a complete ISO-8601 date and time (at least to the second)."""
+    if len(ts) < 19 or ts[10] != "T":
+        return False
+    try:
+        parse_ts(ts)
+    except ValueError:
+        return False
+    return True
+
 
-def find_all_hosts() -> list[str]:
-    """Find all host directories in the log directory."""
-    log_path = Path(LOG_DIR)
-    if not log_path.exists():
+def read_all_hosts(read_host, hosts: tuple[str, ...]) -> list[dict]:
+    """
+    Run a per-host reader across hosts in a thread pool.
+    
+    Reads are I/O-bound, so threads overlap the open/read latency of each
+    host directory. Rows are concatenated in host order.
+    """
+    if not hosts:
         return []
-    return [d.name for d in log_path.iterdir() if d.is_dir()]
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(hosts))) as ex:
+        return list(chain.from_iterable(ex.map(read_host, hosts)))
+
 
+def convert_fields(row: dict, int_fields: tuple[str, ...], float_fields: tuple[str, ...]):
+    """Convert the named fields of a CSV row in place; blank or missing values become None."""
+    for name in int_fields:
+        value = row.get(name)
+        row[name] = int(value) if value else None
+    for name in float_fields:
+        value = row.get(name)
+        row[name] = float(value) if value else None
 
-def read_csv_logs(filename: str, host: Optional[str] = None) -> list[dict]:
-    """Read CSV logs from all hosts or a specific host."""
-    rows = []
-    hosts = [host] if host else find_all_hosts()
+
+@lru_cache(maxsize=None)
+def read_csv_logs(
+    filename: str,
+    host: Optional[str] = None,
+    int_fields: tuple[str, ...] = (),
+    float_fields: tuple[str, ...] = (),
+    sort: bool = True,
+) -> list[dict]:
+    """
+    Read CSV logs from all hosts or a specific host.
     
-    for h in hosts:
+    Fields named in int_fields/float_fields are converted once at ingest;
+    blank or missing values become None. Rows are sorted by timestamp
+    unless sort=False, for callers that only aggregate. Results are cached
+    for the life of the process; callers must not mutate the returned rows.
+    """
+    def read_host(h: str) -> list[dict]:
+        rows = []
         filepath = Path(LOG_DIR) / h / filename
         if not filepath.exists():
-            continue
-        with open(filepath, newline="") as f:
+            return rows
+        with open(filepath, newline="", buffering=READ_BUFFER_SIZE) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 row["_host"] = h
+                row.setdefault("ts", "")
+                convert_fields(row, int_fields, float_fields)
                 rows.append(row)
+        return rows
+    
+    rows = read_all_hosts(read_host, (host,) if host else find_all_hosts())
     
     # Sort by timestamp
-    rows.sort(key=lambda r: r.get("ts", ""))
+    if sort:
+        rows.sort(key=itemgetter("ts"))
     return rows
 
 
-def read_jsonl_logs(filename: str, host: Optional[str] = None) -> list[dict]:
-    """Read JSONL logs from all hosts or a specific host."""
-    rows = []
-    hosts = [host] if host else find_all_hosts()
+def iter_csv_logs(
+    filename: str,
+    host: Optional[str] = None,
+    int_fields: tuple[str, ...] = (),
+    float_fields: tuple[str, ...] = (),
+):
+    """
+    Yield CSV rows from all hosts or a specific host, one at a time.
     
-    for h in hosts:
+    Unlike read_csv_logs, nothing is buffered or sorted, so aggregate-only
+    commands run in constant memory regardless of log size.
+    """
+    for h in (host,) if host else find_all_hosts():
         filepath = Path(LOG_DIR) / h / filename
         if not filepath.exists():
             continue
-        with open(filepath) as f:
+        with open(filepath, newline="", buffering=READ_BUFFER_SIZE) as f:
+            for row in csv.DictReader(f):
+                row["_host"] = h
+                convert_fields(row, int_fields, float_fields)
+                yield row
+
+
+def read_csv_logs_since(
+    filename: str,
+    cutoff: str,
+    host: Optional[str] = None,
+    int_fields: tuple[str, ...] = (),
+    float_fields: tuple[str, ...] = (),
+    sort: bool = True,
+) -> list[dict]:
+    """
+    Read only the CSV rows with ts >= cutoff from all hosts or a specific host.
+    
+    Each file is scanned backwards from the end in TAIL_CHUNK_SIZE chunks and
+    reading stops at the first well-formed ts older than cutoff, so the cost
+    scales with the recent window instead of the whole log. Rows with a blank
+    or truncated ts are skipped without ending the scan.
+    
+    This relies on each host's file being appended in timestamp order, as
+    the probes write it. A stale but well-formed ts (e.g. a Pi without an RTC
+    logging before NTP sync after a reboot) still ends the scan early, so
+    older rows inside the window behind it are not returned.
+    """
+    def read_host(h: str) -> list[dict]:
+        filepath = Path(LOG_DIR) / h / filename
+        if not filepath.exists():
+            return []
+        
+        lines = []
+        with open(filepath, "rb") as f:
+            header = next(csv.reader([f.readline().decode()]), [])
+            if "ts" not in header:
+                return []
+            ts_index = header.index("ts")
+            header_end = f.tell()
+            
+            pos = f.seek(0, os.SEEK_END)
+            partial = b""
+            done = False
+            while pos > header_end and not done:
+                size = min(TAIL_CHUNK_SIZE, pos - header_end)
+                pos -= size
+                f.seek(pos)
+                parts = (f.read(size) + partial).split(b"\n")
+                # The first piece may be the tail of a line that starts in the previous chunk
+                partial = parts.pop(0) if pos > header_end else b""
+                
+                for raw in reversed(parts):
+                    line = raw.decode().rstrip("\r")
+                    if not line:
+                        continue
+                    values = next(csv.reader([line]))
+                    if ts_index >= len(values):
+                        continue
+                    ts = values[ts_index]
+                    if ts < cutoff:
+                        if not is_full_ts(ts):
+                            # Malformed ts: drop the row, as a full read would, but keep scanning
+                            continue
+                        done = True
+                        break
+                    lines.append(line)
+        
+        lines.reverse()
+        rows = []
+        for row in csv.DictReader(lines, fieldnames=header):
+            row["_host"] = h
+            row.setdefault("ts", "")
+            convert_fields(row, int_fields, float_fields)
+            rows.append(row)
+        return rows
+    
+    rows = read_all_hosts(read_host, (host,) if host else find_all_hosts())
+    
+    if sort:
+        rows.sort(key=itemgetter("ts"))
+    return rows
+
+
+@lru_cache(maxsize=None)
+def read_jsonl_logs(filename: str, host: Optional[str] = None, sort: bool = True) -> list[dict]:
+    """
+    Read JSONL logs from all hosts or a specific host.
+    
+    Rows are sorted by timestamp unless sort=False. Results are cached for
+    the life of the process; callers must not mutate the returned rows.
+    """
+    def read_host(h: str) -> list[dict]:
+        rows = []
+        filepath = Path(LOG_DIR) / h / filename
+        if not filepath.exists():
+            return rows
+        with open(filepath, "rb", buffering=READ_BUFFER_SIZE) as f:
             for line in f:
                 try:
-                    obj = json.loads(line.strip())
+                    obj = json_loads(line)
                     obj["_host"] = h
+                    obj.setdefault("ts", "")
                     rows.append(obj)
                 except json.JSONDecodeError:
                     continue
+        return rows
+    
+    rows = read_all_hosts(read_host, (host,) if host else find_all_hosts())
     
-    rows.sort(key=lambda r: r.get("ts", ""))
+    if sort:
+        rows.sort(key=itemgetter("ts"))
     return rows
 
 
+def load_csv_columns(filename: str, types: dict[str, type], host: Optional[str] = None) -> dict[str, list]:
+    """
+    Read selected CSV columns from all hosts into parallel lists.
+    
+    Each value is converted once with its column's type; blank or missing
+    values become None. A "_host" column is always included. Rows are
+    parsed with csv.reader and a header index rather than one dict per row.
+    """
+    def read_host(h: str) -> dict[str, list]:
+        columns = {name: [] for name in types}
+        count = 0
+        filepath = Path(LOG_DIR) / h / filename
+        if filepath.exists():
+            with open(filepath, newline="", buffering=READ_BUFFER_SIZE) as f:
+                reader = csv.reader(f)
+                index = {name: i for i, name in enumerate(next(reader, []))}
+                fields = [(columns[name], conv, index.get(name, -1)) for name, conv in types.items()]
+                for row in reader:
+                    if not row:
+                        continue
+                    count += 1
+                    for values, conv, i in fields:
+                        value = row[i] if 0 <= i < len(row) else None
+                        values.append(conv(value) if value else None)
+        columns["_host"] = [h] * count
+        return columns
+    
+    columns = {name: [] for name in types}
+    columns["_host"] = []
+    hosts = (host,) if host else find_all_hosts()
+    if not hosts:
+        return columns
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(hosts))) as ex:
+        for part in ex.map(read_host, hosts):
+            for name, values in part.items():
+                columns[name].extend(values)
+    
+    return columns
+
+
+def group_by_host(rows: list[dict]) -> dict[str, list[dict]]:
+    """Group rows by host in a single pass, preserving their order."""
+    by_host = defaultdict(list)
+    for r in rows:
+        by_host[r["_host"]].append(r)
+    return by_host
+
+
+def split_by_host(columns: dict[str, list], name: str) -> dict[str, list]:
+    """Group the non-missing values of one column by host in a single pass."""
+    by_host = defaultdict(list)
+    for h, value in zip(columns["_host"], columns[name]):
+        if value is not None:
+            by_host[h].append(value)
+    return by_host
+
+
 def cmd_summary():
     """Show overall health summary across all Pis."""
     hosts = find_all_hosts()
@@ -92,41 +341,54 @@ def cmd_summary():
     print(f"Hosts found: {', '.join(hosts)}\n")
     
     # Net probe summary
-    net_logs = read_csv_logs("net_probe.csv")
-    if net_logs:
-        total = len(net_logs)
-        wan_failures = sum(1 for r in net_logs if float(r.get("wan_loss_pct", 0) or 0) == 100)
-        gw_failures = sum(1 for r in net_logs if float(r.get("gw_loss_pct", 0) or 0) == 100)
-        dns_failures = sum(1 for r in net_logs if r.get("dns_ok") == "0")
-        
+    total = wan_failures = gw_failures = dns_failures = 0
+    for row in iter_csv_logs("net_probe.csv", float_fields=("wan_loss_pct", "gw_loss_pct")):
+        total += 1
+        wan_failures += row["wan_loss_pct"] == 100
+        gw_failures += row["gw_loss_pct"] == 100
+        dns_failures += row.get("dns_ok") == "0"
+    
+    if total:
         print(f"Network Probes: {total} total")
         print(f"  Gateway failures:  {gw_failures} ({100*gw_failures/total:.1f}%)")
         print(f"  WAN failures:      {wan_failures} ({100*wan_failures/total:.1f}%)")
         print(f"  DNS failures:      {dns_failures} ({100*dns_failures/total:.1f}%)")
         print()
     
-    # WiFi probe summary
-    wifi_logs = read_csv_logs("wifi_probe.csv")
-    if wifi_logs:
-        print(f"WiFi Probes: {len(wifi_logs)} total")
+    # WiFi probe summary: running [sum, count, min] of signal per host
+    total = 0
+    signal_stats = {}
+    for row in iter_csv_logs("wifi_probe.csv", int_fields=("signal_dbm",)):
+        total += 1
+        signal = row["signal_dbm"]
+        if signal is None:
+            continue
+        stats = signal_stats.get(row["_host"])
+        if stats is None:
+            signal_stats[row["_host"]] = [signal, 1, signal]
+        else:
+            stats[0] += signal
+            stats[1] += 1
+            stats[2] = min(stats[2], signal)
+    
+    if total:
+        print(f"WiFi Probes: {total} total")
         
         # Signal strength stats per host
         for h in hosts:
-            host_logs = [r for r in wifi_logs if r["_host"] == h]
-            if not host_logs:
-                continue
-            signals = [int(r["signal_dbm"]) for r in host_logs if r.get("signal_dbm")]
-            if signals:
-                avg_signal = sum(signals) / len(signals)
-                min_signal = min(signals)
+            if h in signal_stats:
+                signal_sum, count, min_signal = signal_stats[h]
+                avg_signal = signal_sum / count
                 print(f"  {h}: avg signal {avg_signal:.0f} dBm, worst {min_signal} dBm")
         print()
     
     # WAN probe summary
-    wan_logs = read_csv_logs("wan_probe.csv")
-    if wan_logs:
-        total = len(wan_logs)
-        all_down = sum(1 for r in wan_logs if r.get("all_down") == "1")
+    total = all_down = 0
+    for row in iter_csv_logs("wan_probe.csv"):
+        total += 1
+        all_down += row.get("all_down") == "1"
+    
+    if total:
         print(f"WAN Probes: {total} total")
         print(f"  Complete outages: {all_down} ({100*all_down/total:.1f}%)")
         print()
@@ -139,18 +401,18 @@ def cmd_failures():
     failures = []
     
     # Net probe failures
-    for row in read_csv_logs("net_probe.csv"):
-        wan_loss = float(row.get("wan_loss_pct", 0) or 0)
-        gw_loss = float(row.get("gw_loss_pct", 0) or 0)
-        dns_ok = row.get("dns_ok", "1")
+    for row in read_csv_logs("net_probe.csv", float_fields=("wan_loss_pct", "gw_loss_pct"), sort=False):
+        wan_fail = row["wan_loss_pct"] == 100
+        gw_fail = row["gw_loss_pct"] == 100
+        dns_fail = row.get("dns_ok") == "0"
         
-        if wan_loss == 100 or gw_loss == 100 or dns_ok == "0":
+        if wan_fail or gw_fail or dns_fail:
             failure_type = []
-            if gw_loss == 100:
+            if gw_fail:
                 failure_type.append("gateway")
-            if wan_loss == 100:
+            if wan_fail:
                 failure_type.append("WAN")
-            if dns_ok == "0":
+            if dns_fail:
                 failure_type.append("DNS")
             
             failures.append({
@@ -161,7 +423,7 @@ def cmd_failures():
             })
     
     # WAN probe failures
-    for row in read_csv_logs("wan_probe.csv"):
+    for row in read_csv_logs("wan_probe.csv", sort=False):
         if row.get("all_down") == "1":
             failures.append({
                 "ts": row["ts"],
@@ -194,39 +456,39 @@ def cmd_compare():
         print("No hosts found.")
         return
     
-    wifi_logs = read_csv_logs("wifi_probe.csv")
-    net_logs = read_csv_logs("net_probe.csv")
+    wifi = load_csv_columns("wifi_probe.csv", {"signal_dbm": int, "tx_retries": int, "ap_name": str})
+    net = load_csv_columns("net_probe.csv", {"wan_loss_pct": float, "gw_avg_ms": float})
+    
+    signals_by_host = split_by_host(wifi, "signal_dbm")
+    retries_by_host = split_by_host(wifi, "tx_retries")
+    ap_names_by_host = split_by_host(wifi, "ap_name")
+    wan_losses_by_host = split_by_host(net, "wan_loss_pct")
+    gw_rtts_by_host = split_by_host(net, "gw_avg_ms")
     
     for h in hosts:
         print(f"--- {h} ---")
         
         # WiFi stats
-        host_wifi = [r for r in wifi_logs if r["_host"] == h]
-        if host_wifi:
-            signals = [int(r["signal_dbm"]) for r in host_wifi if r.get("signal_dbm")]
-            retries = [int(r["tx_retries"]) for r in host_wifi if r.get("tx_retries")]
-            ap_names = [r.get("ap_name", "unknown") for r in host_wifi if r.get("ap_name")]
-            
-            if signals:
-                print(f"  Signal: avg {sum(signals)/len(signals):.0f} dBm, range [{min(signals)}, {max(signals)}]")
-            if retries:
-                print(f"  TX Retries: avg {sum(retries)/len(retries):.0f}")
-            if ap_names:
-                ap_counts = defaultdict(int)
-                for ap in ap_names:
-                    ap_counts[ap] += 1
-                print(f"  Connected APs: {dict(ap_counts)}")
+        signals = signals_by_host.get(h)
+        retries = retries_by_host.get(h)
+        ap_names = ap_names_by_host.get(h)
+        
+        if signals:
+            print(f"  Signal: avg {sum(signals)/len(signals):.0f} dBm, range [{min(signals)}, {max(signals)}]")
+        if retries:
+            print(f"  TX Retries: avg {sum(retries)/len(retries):.0f}")
+        if ap_names:
+            ap_counts = Counter(ap_names)
+            print(f"  Connected APs: {dict(ap_counts)}")
         
         # Network stats
-        host_net = [r for r in net_logs if r["_host"] == h]
-        if host_net:
-            wan_losses = [float(r["wan_loss_pct"]) for r in host_net if r.get("wan_loss_pct")]
-            gw_rtts = [float(r["gw_avg_ms"]) for r in host_net if r.get("gw_avg_ms")]
-            
-            if wan_losses:
-                print(f"  WAN Loss: avg {sum(wan_losses)/len(wan_losses):.1f}%")
-            if gw_rtts:
-                print(f"  Gateway RTT: avg {sum(gw_rtts)/len(gw_rtts):.1f} ms")
+        wan_losses = wan_losses_by_host.get(h)
+        gw_rtts = gw_rtts_by_host.get(h)
+        
+        if wan_losses:
+            print(f"  WAN Loss: avg {sum(wan_losses)/len(wan_losses):.1f}%")
+        if gw_rtts:
+            print(f"  Gateway RTT: avg {sum(gw_rtts)/len(gw_rtts):.1f} ms")
         
         print()
 
@@ -241,17 +503,15 @@ def cmd_timeline():
     events = []
     
     # Collect significant events
-    for row in read_csv_logs("net_probe.csv"):
-        if row["ts"] < cutoff_str:
-            continue
-        wan_loss = float(row.get("wan_loss_pct", 0) or 0)
+    for row in read_csv_logs_since("net_probe.csv", cutoff_str, float_fields=("wan_loss_pct",), sort=False):
+        wan_loss = row["wan_loss_pct"] or 0
         if wan_loss > 50:
             events.append((row["ts"], row["_host"], f"High WAN loss: {wan_loss:.0f}%"))
     
-    for row in read_csv_logs("wifi_probe.csv"):
-        if row["ts"] < cutoff_str:
-            continue
-        signal = int(row.get("signal_dbm") or -100)
+    for row in read_csv_logs_since("wifi_probe.csv", cutoff_str, int_fields=("signal_dbm",), sort=False):
+        signal = row["signal_dbm"]
+        if signal is None:
+            signal = -100
         if signal < -75:
             ap = row.get("ap_name", row.get("bssid", "unknown"))
             events.append((row["ts"], row["_host"], f"Weak signal: {signal} dBm on {ap}"))
@@ -266,7 +526,7 @@ def cmd_timeline():
     for ts, host, desc in events[-30:]:
         # Format timestamp more readably
         try:
-            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            dt = parse_ts(ts)
             ts_fmt = dt.strftime("%m-%d %H:%M")
         except:
             ts_fmt = ts[:16]
@@ -277,32 +537,34 @@ def cmd_ap_stats():
     """Show AP connection statistics and roaming patterns."""
     print("=== AP Statistics ===\n")
     
-    wifi_logs = read_csv_logs("wifi_probe.csv")
-    if not wifi_logs:
-        print("No WiFi probe logs found.")
-        return
-    
-    # Group by AP
-    ap_stats = defaultdict(lambda: {"count": 0, "signals": [], "hosts": set()})
+    # Group by AP, streaming rows so only per-AP aggregates are kept
+    ap_counts = Counter()
+    ap_stats = defaultdict(lambda: {"signal_sum": 0, "signal_count": 0, "hosts": set()})
     
-    for row in wifi_logs:
+    for row in iter_csv_logs("wifi_probe.csv", int_fields=("signal_dbm",)):
         ap = row.get("ap_name") or row.get("bssid") or "unknown"
-        signal = row.get("signal_dbm")
+        signal = row["signal_dbm"]
         
-        ap_stats[ap]["count"] += 1
+        ap_counts[ap] += 1
         ap_stats[ap]["hosts"].add(row["_host"])
-        if signal:
-            ap_stats[ap]["signals"].append(int(signal))
+        if signal is not None:
+            ap_stats[ap]["signal_sum"] += signal
+            ap_stats[ap]["signal_count"] += 1
+    
+    if not ap_counts:
+        print("No WiFi probe logs found.")
+        return
     
     print(f"{'AP Name':<25} {'Samples':>8} {'Avg Signal':>12} {'Hosts'}")
     print("-" * 65)
     
-    for ap, stats in sorted(ap_stats.items(), key=lambda x: -x[1]["count"]):
+    for ap, count in ap_counts.most_common():
+        stats = ap_stats[ap]
         avg_signal = ""
-        if stats["signals"]:
-            avg_signal = f"{sum(stats['signals'])/len(stats['signals']):.0f} dBm"
+        if stats["signal_count"]:
+            avg_signal = f"{stats['signal_sum']/stats['signal_count']:.0f} dBm"
         hosts = ", ".join(stats["hosts"])
-        print(f"{ap:<25} {stats['count']:>8} {avg_signal:>12} {hosts}")
+        print(f"{ap:<25} {count:>8} {avg_signal:>12} {hosts}")
 
 
 def cmd_roaming():
@@ -317,17 +579,18 @@ def cmd_roaming():
         return
     
     hosts = find_all_hosts()
+    events_by_host = group_by_host(events)
     
     # Analyze per host
     for h in hosts:
-        host_events = [e for e in events if e.get("_host") == h]
+        host_events = events_by_host.get(h, [])
         if not host_events:
             continue
         
         print(f"--- {h} ---")
         
         # Count event types
-        event_counts = defaultdict(int)
+        event_counts = Counter()
         roams = []
         disconnects = []
         
@@ -348,14 +611,14 @@ def cmd_roaming():
             print(f"\n  Roaming events: {len(roams)}")
             
             # Count roam paths (from -> to)
-            roam_paths = defaultdict(int)
+            roam_paths = Counter()
             for r in roams:
                 from_ap = r.get("from_ap", r.get("from_bssid", "?"))
                 to_ap = r.get("to_ap", r.get("to_bssid", "?"))
                 roam_paths[f"{from_ap} -> {to_ap}"] += 1
             
             print("  Roaming patterns:")
-            for path, count in sorted(roam_paths.items(), key=lambda x: -x[1])[:5]:
+            for path, count in roam_paths.most_common(5):
                 print(f"    {path}: {count}x")
         
         # Disconnect analysis
@@ -363,8 +626,8 @@ def cmd_roaming():
             print(f"\n  Disconnects: {len(disconnects)}")
             
             # Disconnects by AP
-            dc_by_ap = defaultdict(int)
-            reason_codes = defaultdict(int)
+            dc_by_ap = Counter()
+            reason_codes = Counter()
             for d in disconnects:
                 ap = d.get("ap_name", d.get("bssid", "unknown"))
                 dc_by_ap[ap] += 1
@@ -373,12 +636,12 @@ def cmd_roaming():
             
             if dc_by_ap:
                 print("  Disconnects by AP:")
-                for ap, count in sorted(dc_by_ap.items(), key=lambda x: -x[1])[:5]:
+                for ap, count in dc_by_ap.most_common(5):
                     print(f"    {ap}: {count}x")
             
             if reason_codes:
                 print("  Disconnect reason codes:")
-                for code, count in sorted(reason_codes.items(), key=lambda x: -x[1]):
+                for code, count in reason_codes.most_common():
                     # Common reason codes: 3=deauth leaving, 4=inactivity, 7=class3 frame
                     reason_desc = {
                         "1": "unspecified",
@@ -417,43 +680,50 @@ def cmd_visibility():
     print("helping identify potential roaming targets and coverage gaps.\n")
     
     # Read AP scan logs
-    scan_logs = read_csv_logs("ap_scan.csv")
-    if not scan_logs:
+    scans = load_csv_columns("ap_scan.csv", {
+        "ap_name": str,
+        "bssid": str,
+        "signal_dbm": int,
+        "is_connected": str,
+        "ssid": str,
+        "frequency_mhz": int,
+    })
+    if not scans["_host"]:
         print("No AP scan logs found.")
         print("Ensure ap_scan.sh is running and logs are synced.")
         return
     
+    # Keep strongest signal seen for each (host, AP) in one pass over the columns
+    # ("strength" treats a missing signal as -100)
+    visibility_by_host = defaultdict(dict)
+    for h, ap_name, bssid, signal, connected, ssid, freq in zip(
+        scans["_host"], scans["ap_name"], scans["bssid"], scans["signal_dbm"],
+        scans["is_connected"], scans["ssid"], scans["frequency_mhz"],
+    ):
+        ap = ap_name or bssid or "unknown"
+        ap_visibility = visibility_by_host[h]
+        if ap not in ap_visibility or (signal is not None and signal > ap_visibility[ap]["strength"]):
+            ap_visibility[ap] = {
+                "signal": signal,
+                "strength": -100 if signal is None else signal,
+                "connected": connected == "1",
+                "ssid": ssid or "",
+                "freq": freq
+            }
+    
     hosts = find_all_hosts()
     
     for h in hosts:
-        host_scans = [s for s in scan_logs if s.get("_host") == h]
-        if not host_scans:
+        ap_visibility = visibility_by_host.get(h)
+        if not ap_visibility:
             continue
         
         print(f"--- {h} ---")
         
-        # Get most recent scan for each AP
-        ap_visibility = {}
-        for s in host_scans:
-            ap = s.get("ap_name") or s.get("bssid") or "unknown"
-            signal = s.get("signal_dbm", "")
-            is_connected = s.get("is_connected") == "1"
-            ssid = s.get("ssid", "")
-            freq = s.get("frequency_mhz", "")
-            
-            # Keep strongest signal seen for each AP
-            if ap not in ap_visibility or (signal and int(signal) > int(ap_visibility[ap].get("signal", -100) or -100)):
-                ap_visibility[ap] = {
-                    "signal": signal,
-                    "connected": is_connected,
-                    "ssid": ssid,
-                    "freq": freq
-                }
-        
         # Sort by signal strength
         sorted_aps = sorted(
             ap_visibility.items(),
-            key=lambda x: int(x[1].get("signal") or -100),
+            key=lambda x: x[1]["strength"],
             reverse=True
         )
         
@@ -461,19 +731,20 @@ def cmd_visibility():
         print("  " + "-" * 55)
         
         for ap, info in sorted_aps[:10]:
-            signal = info.get("signal", "")
-            freq = info.get("freq", "")
-            band = "5GHz" if freq and int(freq) > 3000 else "2.4GHz" if freq else ""
+            signal = info["signal"]
+            freq = info["freq"]
+            band = "5GHz" if freq is not None and freq > 3000 else "2.4GHz" if freq is not None else ""
             status = "* CONNECTED" if info.get("connected") else ""
             
             # Color code signal strength
-            if signal:
-                sig_int = int(signal)
-                if sig_int >= -50:
+            if signal is None:
+                signal = ""
+            else:
+                if signal >= -50:
                     quality = "(excellent)"
-                elif sig_int >= -60:
+                elif signal >= -60:
                     quality = "(good)"
-                elif sig_int >= -70:
+                elif signal >= -70:
                     quality = "(fair)"
                 else:
                     quality = "(weak)"
@@ -484,9 +755,9 @@ def cmd_visibility():
         # Identify potential better APs
         connected_ap = next((ap for ap, info in sorted_aps if info.get("connected")), None)
         if connected_ap:
-            connected_signal = int(ap_visibility[connected_ap].get("signal") or -100)
+            connected_signal = ap_visibility[connected_ap]["strength"]
             better_aps = [(ap, info) for ap, info in sorted_aps 
-                         if not info.get("connected") and int(info.get("signal") or -100) > connected_signal + 5]
+                         if not info.get("connected") and info["strength"] > connected_signal + 5]
             
             if better_aps:
                 print(f"\n  Note: {len(better_aps)} AP(s) have stronger signal than current connection!")
@@ -514,10 +785,12 @@ def cmd_sticky():
         return
     
     hosts = find_all_hosts()
+    wifi_by_host = group_by_host(wifi_logs)
+    scans_by_host = group_by_host(scan_logs)
     
     for h in hosts:
-        host_wifi = [w for w in wifi_logs if w.get("_host") == h]
-        host_scans = [s for s in scan_logs if s.get("_host") == h]
+        host_wifi = wifi_by_host.get(h, [])
+        host_scans = scans_by_host.get(h, [])
         
         if not host_wifi or not host_scans:
             continue
@@ -550,8 +823,8 @@ def cmd_sticky():
             nearby_scans = []
             for ts_key, scans in scan_by_time.items():
                 try:
-                    wifi_dt = datetime.fromisoformat(w.get("ts", "").replace("Z", "+00:00"))
-                    scan_dt = datetime.fromisoformat(ts_key + ":00")
+                    wifi_dt = parse_ts(w.get("ts", ""))
+                    scan_dt = parse_ts(ts_key + ":00")
                     if abs((wifi_dt - scan_dt).total_seconds()) < 300:
                         nearby_scans.extend(scans)
                 except (ValueError, TypeError):
@@ -630,7 +903,7 @@ def cmd_sticky():
             print("\n  Recent sticky events:")
             for e in sticky_events[-5:]:
                 try:
-                    dt = datetime.fromisoformat(e["ts"].replace("Z", "+00:00"))
+                    dt = parse_ts(e["ts"])
                     ts_fmt = dt.strftime("%m-%d %H:%M")
                 except:
                     ts_fmt = e["ts"][:16]
@@ -670,9 +943,10 @@ def cmd_band_usage():
         return
     
     hosts = find_all_hosts()
+    wifi_by_host = group_by_host(wifi_logs)
     
     for h in hosts:
-        host_logs = [r for r in wifi_logs if r.get("_host") == h]
+        host_logs = wifi_by_host.get(h, [])
         if not host_logs:
             continue
         
@@ -710,7 +984,7 @@ def cmd_band_usage():
             
             # Track by hour
             try:
-                dt = datetime.fromisoformat(r.get("ts", "").replace("Z", "+00:00"))
+                dt = parse_ts(r.get("ts", ""))
                 hourly_band[dt.hour][band] += 1
             except:
                 pass
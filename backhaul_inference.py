@@ -17,133 +17,269 @@ import csv
 import json
 import os
 import sys
+from array import array
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from statistics import mean, stdev
 from typing import Optional
 
+try:
+    # Optional C-accelerated parser; both it and json.loads accept bytes
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Default log directory (central collector)
 LOG_DIR = os.environ.get("NETDIAG_LOG_DIR", "/var/log/netdiag")
 
+# Upper bound on concurrent per-host file reads
+MAX_READ_WORKERS = 16
+
+# Per-measurement fields, stored per AP as parallel columns
+MEASUREMENT_FIELDS = ("throughput_mbps", "mode", "host", "ts", "signal_dbm")
+
+# Read buffer for log files (1 MiB) - fewer read() syscalls on large logs
+READ_BUFFER_SIZE = 1 << 20
 
-def find_all_hosts() -> list[str]:
-    """Find all host directories in the log directory."""
-    log_path = Path(LOG_DIR)
-    if not log_path.exists():
+
+@lru_cache(maxsize=1)
+def find_all_hosts() -> tuple[str, ...]:
+    """
+    Find all host directories in the log directory.
+    
+    The directory is scanned once per process; later calls reuse the result.
+    """
+    if not os.path.isdir(LOG_DIR):
+        return ()
+    with os.scandir(LOG_DIR) as entries:
+        return tuple(e.name for e in entries if e.is_dir())
+
+
+def read_all_hosts(read_host, hosts: tuple[str, ...]) -> list[dict]:
+    """
+    Run a per-host reader across hosts in a thread pool.
+    
+    Reads are I/O-bound, so threads overlap the open/read latency of each
+    host directory. Rows are concatenated in host order.
+    """
+    if not hosts:
         return []
-    return [d.name for d in log_path.iterdir() if d.is_dir()]
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(hosts))) as ex:
+        return list(chain.from_iterable(ex.map(read_host, hosts)))
+
+
+def parse_ts_epoch(ts: str) -> Optional[float]:
+    """Parse an ISO-8601 timestamp to epoch seconds, or None if malformed."""
+    try:
+        return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
 
 
 def read_iperf_logs(host: Optional[str] = None) -> list[dict]:
-    """Read iperf JSONL logs from all hosts or a specific host."""
-    rows = []
-    hosts = [host] if host else find_all_hosts()
+    """
+    Read iperf JSONL logs from all hosts or a specific host.
     
-    for h in hosts:
+    Each line is projected to the few scalars the analysis needs (ts, mode,
+    ok, throughput_mbps) as it is parsed; the full iperf result tree is not
+    retained.
+    """
+    def read_host(h: str) -> list[dict]:
+        rows = []
         filepath = Path(LOG_DIR) / h / "iperf.jsonl"
         if not filepath.exists():
-            continue
-        with open(filepath) as f:
+            return rows
+        with open(filepath, "rb", buffering=READ_BUFFER_SIZE) as f:
             for line in f:
                 try:
-                    obj = json.loads(line.strip())
-                    obj["_host"] = h
-                    
-                    # Extract throughput from iperf results
-                    if obj.get("ok") and "iperf" in obj:
-                        iperf = obj["iperf"]
-                        # Get bits_per_second from end summary
-                        end = iperf.get("end", {})
-                        sum_recv = end.get("sum_received", {})
-                        sum_sent = end.get("sum_sent", {})
-                        
-                        # Use received for download, sent for upload
-                        if obj.get("mode") == "download":
-                            obj["throughput_mbps"] = sum_recv.get("bits_per_second", 0) / 1_000_000
-                        else:
-                            obj["throughput_mbps"] = sum_sent.get("bits_per_second", 0) / 1_000_000
-                    else:
-                        obj["throughput_mbps"] = 0
-                    
-                    rows.append(obj)
+                    obj = json_loads(line)
                 except json.JSONDecodeError:
                     continue
+                
+                ts = obj.get("ts", "")
+                mode = obj.get("mode", "unknown")
+                ok = bool(obj.get("ok"))
+                
+                # Extract throughput from the iperf end summary:
+                # received for download, sent for upload
+                throughput_mbps = 0
+                if ok and "iperf" in obj:
+                    end = obj["iperf"].get("end", {})
+                    summary = end.get("sum_received" if mode == "download" else "sum_sent", {})
+                    throughput_mbps = summary.get("bits_per_second", 0) / 1_000_000
+                
+                rows.append({
+                    "ts": ts,
+                    "mode": mode,
+                    "ok": ok,
+                    "throughput_mbps": throughput_mbps,
+                    "_host": h,
+                    "_ts_epoch": parse_ts_epoch(ts),
+                })
+        return rows
     
-    rows.sort(key=lambda r: r.get("ts", ""))
+    rows = read_all_hosts(read_host, (host,) if host else find_all_hosts())
+    
+    rows.sort(key=itemgetter("ts"))
     return rows
 
 
 def read_wifi_logs(host: Optional[str] = None) -> list[dict]:
     """Read WiFi probe CSV logs."""
-    rows = []
-    hosts = [host] if host else find_all_hosts()
-    
-    for h in hosts:
+    def read_host(h: str) -> list[dict]:
+        rows = []
         filepath = Path(LOG_DIR) / h / "wifi_probe.csv"
         if not filepath.exists():
-            continue
-        with open(filepath, newline="") as f:
+            return rows
+        with open(filepath, newline="", buffering=READ_BUFFER_SIZE) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 row["_host"] = h
+                row.setdefault("ts", "")
+                row["_ts_epoch"] = parse_ts_epoch(row.get("ts"))
                 rows.append(row)
+        return rows
     
-    rows.sort(key=lambda r: r.get("ts", ""))
+    rows = read_all_hosts(read_host, (host,) if host else find_all_hosts())
+    
+    rows.sort(key=itemgetter("ts"))
     return rows
 
 
+def match_nearest(query_ts: list[float], ref_ts: list[float], max_diff: float) -> list[int]:
+    """
+    Match each query timestamp to the index of the nearest reference timestamp.
+    
+    Both lists must be sorted ascending epoch seconds. A single pointer walks
+    ref_ts alongside query_ts, so the whole match is O(N + M). Entries with
+    no reference strictly within max_diff seconds get -1; ties go to the
+    earlier reference, and among equal reference timestamps to the first.
+    """
+    matches = []
+    j = 0
+    n = len(ref_ts)
+    
+    for t in query_ts:
+        while j < n and ref_ts[j] < t:
+            j += 1
+        
+        best = -1
+        best_diff = max_diff
+        if j > 0 and t - ref_ts[j - 1] < best_diff:
+            best = j - 1
+            best_diff = t - ref_ts[j - 1]
+            # Step back to the first sample sharing that timestamp
+            while best > 0 and ref_ts[best - 1] == ref_ts[best]:
+                best -= 1
+        if j < n and ref_ts[j] - t < best_diff:
+            best = j
+        matches.append(best)
+    
+    return matches
+
+
+def new_measurements() -> dict:
+    """Create an empty set of per-AP measurement columns."""
+    return {
+        "throughput_mbps": array("d"),
+        "mode": [],
+        "host": [],
+        "ts": [],
+        "signal_dbm": [],
+    }
+
+
+def measurement_rows(measurements: dict, start: int = 0) -> list[dict]:
+    """Expand measurement columns (from index start) into one dict per measurement."""
+    columns = [measurements[name][start:] for name in MEASUREMENT_FIELDS]
+    return [dict(zip(MEASUREMENT_FIELDS, values)) for values in zip(*columns)]
+
+
 def correlate_throughput_with_ap(iperf_logs: list[dict], wifi_logs: list[dict]) -> dict:
     """
     Correlate iperf measurements with the AP that was connected at that time.
-    Returns a dict of ap_name -> list of throughput measurements.
+    Returns a dict of ap_name -> measurements, stored as parallel columns
+    keyed by MEASUREMENT_FIELDS (throughput_mbps is a float array).
     """
-    ap_throughput = defaultdict(list)
+    ap_throughput = defaultdict(new_measurements)
     
-    # Index wifi logs by host and timestamp for efficient lookup
+    # Index wifi logs by host for efficient lookup
     wifi_by_host = defaultdict(list)
     for w in wifi_logs:
-        wifi_by_host[w["_host"]].append(w)
+        if w.get("_ts_epoch") is not None:
+            wifi_by_host[w["_host"]].append(w)
     
-    for iperf in iperf_logs:
-        if not iperf.get("ok") or iperf.get("throughput_mbps", 0) == 0:
+    # Successful iperf runs, in input order, with their positions grouped by host
+    measured = [
+        i for i in iperf_logs
+        if i.get("ok") and i.get("throughput_mbps", 0) != 0 and i.get("_ts_epoch") is not None
+    ]
+    positions_by_host = defaultdict(list)
+    for pos, iperf in enumerate(measured):
+        positions_by_host[iperf["_host"]].append(pos)
+    
+    # Find the closest wifi probe to each iperf measurement, within 5 minutes
+    closest = [None] * len(measured)
+    for host, positions in positions_by_host.items():
+        host_wifi = wifi_by_host.get(host)
+        if not host_wifi:
+            continue
+        host_wifi.sort(key=lambda w: w["_ts_epoch"])
+        positions.sort(key=lambda p: measured[p]["_ts_epoch"])
+        matches = match_nearest(
+            [measured[p]["_ts_epoch"] for p in positions],
+            [w["_ts_epoch"] for w in host_wifi],
+            300,
+        )
+        for pos, idx in zip(positions, matches):
+            if idx >= 0:
+                closest[pos] = host_wifi[idx]
+    
+    for iperf, closest_wifi in zip(measured, closest):
+        if closest_wifi is None:
             continue
         
-        host = iperf["_host"]
-        ts = iperf["ts"]
-        
-        # Find the closest wifi probe to this iperf measurement
-        host_wifi = wifi_by_host.get(host, [])
-        closest_wifi = None
-        min_diff = float("inf")
-        
-        for w in host_wifi:
-            try:
-                iperf_dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                wifi_dt = datetime.fromisoformat(w["ts"].replace("Z", "+00:00"))
-                diff = abs((iperf_dt - wifi_dt).total_seconds())
-                if diff < min_diff:
-                    min_diff = diff
-                    closest_wifi = w
-            except (ValueError, KeyError):
-                continue
+        ap_name = closest_wifi.get("ap_name") or closest_wifi.get("bssid") or "unknown"
+        signal = closest_wifi.get("signal_dbm", "")
         
-        # Only correlate if wifi measurement is within 5 minutes
-        if closest_wifi and min_diff < 300:
-            ap_name = closest_wifi.get("ap_name") or closest_wifi.get("bssid") or "unknown"
-            signal = closest_wifi.get("signal_dbm", "")
-            
-            ap_throughput[ap_name].append({
-                "throughput_mbps": iperf["throughput_mbps"],
-                "mode": iperf.get("mode", "unknown"),
-                "host": host,
-                "ts": ts,
-                "signal_dbm": int(signal) if signal else None
-            })
+        measurements = ap_throughput[ap_name]
+        measurements["throughput_mbps"].append(iperf["throughput_mbps"])
+        measurements["mode"].append(iperf.get("mode", "unknown"))
+        measurements["host"].append(iperf["_host"])
+        measurements["ts"].append(iperf["ts"])
+        measurements["signal_dbm"].append(int(signal) if signal else None)
     
     return ap_throughput
 
 
+def throughput_stats(values) -> tuple[float, float, float, float]:
+    """
+    Compute mean, sample standard deviation, min and max in a single pass.
+    
+    Uses Welford's online update so the values are walked once; stdev is 0
+    for fewer than two values.
+    """
+    n = 0
+    avg = 0.0
+    m2 = 0.0
+    lo = hi = values[0]
+    for x in values:
+        n += 1
+        delta = x - avg
+        avg += delta / n
+        m2 += delta * (x - avg)
+        if x < lo:
+            lo = x
+        elif x > hi:
+            hi = x
+    std = (m2 / (n - 1)) ** 0.5 if n > 1 else 0
+    return avg, std, lo, hi
+
+
 def analyze_backhaul_quality(ap_throughput: dict) -> list[dict]:
     """
     Analyze throughput measurements per AP to infer backhaul quality.
@@ -152,16 +288,15 @@ def analyze_backhaul_quality(ap_throughput: dict) -> list[dict]:
     results = []
     
     for ap_name, measurements in ap_throughput.items():
-        throughputs = [m["throughput_mbps"] for m in measurements]
-        signals = [m["signal_dbm"] for m in measurements if m["signal_dbm"] is not None]
-        hosts = set(m["host"] for m in measurements)
+        throughputs = measurements["throughput_mbps"]
+        signals = [s for s in measurements["signal_dbm"] if s is not None]
+        hosts = set(measurements["host"])
         
         if not throughputs:
             continue
         
-        avg_throughput = mean(throughputs)
-        std_throughput = stdev(throughputs) if len(throughputs) > 1 else 0
-        avg_signal = mean(signals) if signals else None
+        avg_throughput, std_throughput, min_throughput, max_throughput = throughput_stats(throughputs)
+        avg_signal = sum(signals) / len(signals) if signals else None
         
         # Infer backhaul quality based on throughput
         # These thresholds are rough estimates - adjust based on your ISP speed
@@ -178,10 +313,10 @@ def analyze_backhaul_quality(ap_throughput: dict) -> list[dict]:
             "ap_name": ap_name,
             "avg_throughput_mbps": avg_throughput,
             "std_throughput_mbps": std_throughput,
-            "min_throughput_mbps": min(throughputs),
-            "max_throughput_mbps": max(throughputs),
+            "min_throughput_mbps": min_throughput,
+            "max_throughput_mbps": max_throughput,
             "avg_signal_dbm": avg_signal,
-            "sample_count": len(measurements),
+            "sample_count": len(throughputs),
             "hosts": list(hosts),
             "quality": quality,
             "measurements": measurements
@@ -242,7 +377,7 @@ def print_report(results: list[dict], detailed: bool = False):
                 print(f"  Avg Signal: {r['avg_signal_dbm']:.0f} dBm")
             print(f"  Samples: {r['sample_count']}")
             print("  Recent measurements:")
-            for m in r["measurements"][-5:]:
+            for m in measurement_rows(r["measurements"], start=-5):
                 print(f"    {m['ts'][:16]} | {m['host']:15} | {m['mode']:8} | {m['throughput_mbps']:.1f} Mbps")
 
 
@@ -265,8 +400,10 @@ def main():
     
     if as_json:
         # Remove measurements from JSON output unless detailed
-        if not detailed:
-            for r in results:
+        for r in results:
+            if detailed:
+                r["measurements"] = measurement_rows(r["measurements"])
+            else:
                 del r["measurements"]
         print(json.dumps(results, indent=2))
     else:
@@ -9,23 +9,45 @@ Usage:
   python3 coverage_gaps.py              # Full coverage analysis
   python3 coverage_gaps.py --summary    # Quick summary only
   python3 coverage_gaps.py --json       # Output as JSON
+  python3 coverage_gaps.py --no-cache   # Ignore cached results from a previous run
 
 Run from the central collector where logs are aggregated.
 """
 
 import csv
+import hashlib
 import json
+import math
 import os
 import sys
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from pathlib import Path
+from functools import lru_cache
+from operator import itemgetter
 from statistics import mean, stdev
 from typing import Optional
 
+try:
+    # Optional Rust serializer, several times faster than json.dumps on large reports
+    import orjson
+
+    def json_dumps_indented(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_dumps_indented(obj) -> str:
+        return json.dumps(obj, indent=2)
+
 # Default log directory (central collector)
 LOG_DIR = os.environ.get("NETDIAG_LOG_DIR", "/var/log/netdiag")
 
+# Analysis results are cached here and reused while the input logs are unchanged
+CACHE_DIR = os.environ.get("NETDIAG_CACHE_DIR", "/var/cache/netdiag")
+
+# Opt-in: queue kernel readahead for all host logs before parsing (Linux only)
+PREFETCH_LOGS = os.environ.get("NETDIAG_PREFETCH") == "1"
+
 # Signal strength thresholds (dBm)
 EXCELLENT_SIGNAL = -50
 GOOD_SIGNAL = -60
@@ -33,65 +55,261 @@ FAIR_SIGNAL = -70
 WEAK_SIGNAL = -75
 DEAD_ZONE_THRESHOLD = -80
 
+# Upper bound on worker processes for per-host analysis
+MAX_HOST_WORKERS = os.cpu_count() or 1
+
+# Read buffer for log files (1 MiB) - fewer read() syscalls on large logs
+READ_BUFFER_SIZE = 1 << 20
+
+# Per-host logs the analysis reads
+LOG_FILES = ("wifi_probe.csv", "ap_scan.csv")
+
+# Columns read from each log, in the order rows are returned
+WIFI_FIELDS = ("signal_dbm", "snr_db", "band")
+SCAN_FIELDS = ("ap_name", "bssid", "signal_dbm")
+
+# Bucket boundaries for bisect_right: 0=dead, 1=weak, 2=fair, 3=good, 4=excellent
+SIGNAL_BUCKETS = (WEAK_SIGNAL, FAIR_SIGNAL, GOOD_SIGNAL, EXCELLENT_SIGNAL)
+# Score weight of each bucket, in the same order
+BUCKET_WEIGHTS = (0, 30, 60, 80, 100)
+
+# Score boundaries for bisect_right and the rating of each band
+RATING_THRESHOLDS = (25, 50, 75, 90)
+RATINGS = ("Critical", "Poor", "Fair", "Good", "Excellent")
+
+# Report boundaries for bisect_right, with the indicator and status of each band
+REPORT_THRESHOLDS = (50, 75)
+REPORT_INDICATORS = ("✗", "!", "✓")
+REPORT_STATUSES = ("❌ Poor", "⚠️  Fair", "✅ Good")
+
 
 def find_all_hosts() -> list[str]:
-    """Find all host directories in the log directory."""
-    log_path = Path(LOG_DIR)
-    if not log_path.exists():
+    """
+    Find all host directories in the log directory.
+    
+    The listing is memoized on the directory's mtime, so repeat calls only
+    cost a stat() until a host directory is added or removed.
+    """
+    try:
+        mtime_ns = os.stat(LOG_DIR).st_mtime_ns
+    except OSError:
         return []
+    return list(list_host_dirs(LOG_DIR, mtime_ns))
+
+
+@lru_cache(maxsize=4)
+def list_host_dirs(log_dir: str, mtime_ns: int) -> tuple[str, ...]:
+    """List host directories under log_dir; mtime_ns is only part of the cache key."""
     # Exclude common non-host directories
     exclude = {"failures", "snapshots", "archive"}
-    return [d.name for d in log_path.iterdir() if d.is_dir() and d.name not in exclude]
+    with os.scandir(log_dir) as entries:
+        return tuple(e.name for e in entries if e.is_dir() and e.name not in exclude)
 
 
-def read_csv_logs(filename: str, host: Optional[str] = None) -> list[dict]:
-    """Read CSV logs from all hosts or a specific host."""
-    rows = []
-    hosts = [host] if host else find_all_hosts()
+def prefetch_logs(hosts: list[str], filenames: tuple[str, ...]):
+    """
+    Ask the kernel to start reading every host's logs in the background.
+    
+    One POSIX_FADV_WILLNEED per file queues asynchronous readahead for all
+    hosts up front, so by the time a worker parses a file it is already
+    (mostly) in the page cache. No-op where posix_fadvise is unavailable.
     
+    Only used when NETDIAG_PREFETCH=1: it costs an extra open/close per
+    file, and on log sets larger than RAM the readahead can evict files
+    before they are parsed.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
     for h in hosts:
-        filepath = Path(LOG_DIR) / h / filename
-        if not filepath.exists():
+        for filename in filenames:
+            try:
+                fd = os.open(f"{LOG_DIR}/{h}/{filename}", os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
+
+def iter_csv_fields(filepath: str, fields: tuple[str, ...]):
+    """
+    Yield the named CSV columns of each row in filepath as a tuple.
+    
+    Columns are located via the file's header once instead of a dict per
+    row, and columns missing from the header read as "". Rows are yielded
+    as they are read, so callers can aggregate without holding the file.
+    """
+    with open(filepath, newline="", buffering=READ_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        index = {name: i for i, name in enumerate(header)}
+        
+        # Rows are normalized to width + 1 values; absent columns read the trailing ""
+        indices = [index.get(name, width) for name in fields]
+        if len(indices) > 1:
+            pick = itemgetter(*indices)
+        else:
+            # itemgetter with a single index returns the bare value, not a tuple
+            pick = lambda row: tuple(row[i] for i in indices)
+        blank = [""] * (width + 1)
+        
+        for row in reader:
+            if not row:
+                continue
+            del row[width:]
+            row += blank[len(row):]
+            yield pick(row)
+
+
+def stream_wifi_stats(h: str) -> dict:
+    """
+    Aggregate a host's wifi_probe.csv in a single streaming pass.
+    
+    Only per-host aggregates are kept (signal bucket counts, summed linear
+    power, SNR sum/min, band counts, dead zone event count), so memory stays
+    constant however large the log is. Returns an empty dict if the host
+    has no WiFi log.
+    
+    Probes report a small set of distinct values, so identical raw rows are
+    counted first (in C, via Counter) and each distinct value is parsed and
+    bucketed once, weighted by how often it occurred.
+    """
+    filepath = f"{LOG_DIR}/{h}/wifi_probe.csv"
+    if not os.path.exists(filepath):
+        return {}
+    
+    signal_counts = Counter()
+    snr_total = snr_count = 0
+    min_snr = None
+    band_counts = Counter()
+    dead_events = 0
+    
+    row_counts = Counter(iter_csv_fields(filepath, WIFI_FIELDS))
+    for (sig, snr, band), n in row_counts.items():
+        if sig:
+            signal = int(sig)
+            signal_counts[signal] += n
+            if signal < DEAD_ZONE_THRESHOLD:
+                dead_events += n
+        else:
+            # Missing signal counts as a dead zone event but is not scored
+            dead_events += n
+        
+        if snr:
+            snr_value = int(snr)
+            snr_total += n * snr_value
+            snr_count += n
+            if min_snr is None or snr_value < min_snr:
+                min_snr = snr_value
+        
+        if band:
+            band_counts[band] += n
+    
+    counts, power_mw, min_signal = bucket_signal_counts(signal_counts)
+    
+    return {
+        "counts": counts,
+        "power_mw": power_mw,
+        "min_signal": min_signal,
+        "snr_total": snr_total,
+        "snr_count": snr_count,
+        "min_snr": min_snr,
+        "band_counts": band_counts,
+        "dead_zone_events": dead_events,
+    }
+
+
+def stream_scan_stats(h: str) -> dict[str, list]:
+    """
+    Aggregate a host's ap_scan.csv into running [sum, count, max, min] signal per AP.
+    
+    Identical raw (ap_name, bssid, signal) rows are counted first, so the
+    ap_name/bssid fallback and int() parse run once per distinct row rather
+    than once per scan line.
+    
+    Returns an empty dict if the host has no scan log.
+    """
+    filepath = f"{LOG_DIR}/{h}/ap_scan.csv"
+    if not os.path.exists(filepath):
+        return {}
+    
+    visible_aps = {}
+    row_counts = Counter(iter_csv_fields(filepath, SCAN_FIELDS))
+    for (ap_name, bssid, sig), n in row_counts.items():
+        ap = ap_name or bssid
+        if not ap:
             continue
-        with open(filepath, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                row["_host"] = h
-                rows.append(row)
+        signal = int(sig or -100)
+        stats = visible_aps.get(ap)
+        if stats is None:
+            visible_aps[ap] = [n * signal, n, signal, signal]
+        else:
+            stats[0] += n * signal
+            stats[1] += n
+            if signal > stats[2]:
+                stats[2] = signal
+            elif signal < stats[3]:
+                stats[3] = signal
+    return visible_aps
+
+
+def bucket_signal_counts(signal_counts: dict[int, int]) -> tuple[list[int], float, Optional[int]]:
+    """
+    Reduce a signal -> sample count mapping to (bucket counts, summed mW power, min signal).
     
-    rows.sort(key=lambda r: r.get("ts", ""))
-    return rows
+    Bucket counts are indexed like BUCKET_WEIGHTS. Each distinct dBm value
+    is bisected and converted to mW once, weighted by its count, all in a
+    single loop. min signal is None when there are no samples.
+    """
+    counts = [0] * len(BUCKET_WEIGHTS)
+    power_mw = 0.0
+    min_signal = None
+    for signal, n in signal_counts.items():
+        counts[bisect_right(SIGNAL_BUCKETS, signal)] += n
+        power_mw += n * 10 ** (signal / 10)
+        if min_signal is None or signal < min_signal:
+            min_signal = signal
+    return counts, power_mw, min_signal
 
 
-def calculate_coverage_score(signals: list[int]) -> dict:
+def calculate_coverage_score(signals) -> dict:
     """
     Calculate a coverage score (0-100) based on signal measurements.
     
+    signals may be any iterable of ints (list or array). Samples are
+    counted per distinct value first, so the data is walked once.
+    
     Returns dict with score and breakdown.
     """
-    if not signals:
+    counts, power_mw, min_signal = bucket_signal_counts(Counter(signals))
+    if min_signal is None:
         return {"score": 0, "rating": "No Data", "breakdown": {}}
     
-    avg_signal = mean(signals)
-    min_signal = min(signals)
+    return score_from_buckets(counts, power_mw, min_signal)
+
+
+def score_from_buckets(counts: list[int], power_mw: float, min_signal: int) -> dict:
+    """
+    Calculate a coverage score (0-100) from per-bucket sample counts.
+    
+    counts is indexed like BUCKET_WEIGHTS and power_mw is the summed linear
+    power of the samples. avg_signal is a power average: dBm is logarithmic,
+    so samples are converted to mW, averaged, and converted back (averaging
+    -40 and -80 dBm gives about -43 dBm, not -60).
     
-    # Count samples in each category
-    excellent = sum(1 for s in signals if s >= EXCELLENT_SIGNAL)
-    good = sum(1 for s in signals if GOOD_SIGNAL <= s < EXCELLENT_SIGNAL)
-    fair = sum(1 for s in signals if FAIR_SIGNAL <= s < GOOD_SIGNAL)
-    weak = sum(1 for s in signals if WEAK_SIGNAL <= s < FAIR_SIGNAL)
-    dead = sum(1 for s in signals if s < WEAK_SIGNAL)
+    Returns dict with score and breakdown.
+    """
+    total = sum(counts)
+    if not total:
+        return {"score": 0, "rating": "No Data", "breakdown": {}}
     
-    total = len(signals)
+    dead, weak, fair, good, excellent = counts
+    avg_signal = 10 * math.log10(power_mw / total)
     
     # Calculate weighted score
-    score = (
-        (excellent / total * 100) +
-        (good / total * 80) +
-        (fair / total * 60) +
-        (weak / total * 30) +
-        (dead / total * 0)
-    )
+    score = sum(c * w for c, w in zip(counts, BUCKET_WEIGHTS)) / total
     
     # Penalize for dead zone occurrences
     dead_zone_pct = dead / total * 100
@@ -101,16 +319,7 @@ def calculate_coverage_score(signals: list[int]) -> dict:
     score = max(0, min(100, score))
     
     # Determine rating
-    if score >= 90:
-        rating = "Excellent"
-    elif score >= 75:
-        rating = "Good"
-    elif score >= 50:
-        rating = "Fair"
-    elif score >= 25:
-        rating = "Poor"
-    else:
-        rating = "Critical"
+    rating = RATINGS[bisect_right(RATING_THRESHOLDS, score)]
     
     return {
         "score": round(score, 1),
@@ -127,19 +336,121 @@ def calculate_coverage_score(signals: list[int]) -> dict:
     }
 
 
-def analyze_coverage_gaps() -> dict:
+def analyze_host(h: str) -> Optional[dict]:
+    """
+    Score one host's coverage from its own wifi and scan logs.
+    
+    Module-level and keyed only on the host name so it can run in a
+    worker process. Returns None if the host has no signal data.
+    """
+    wifi = stream_wifi_stats(h)
+    if not wifi or wifi["min_signal"] is None:
+        return None
+    
+    # Calculate coverage score for this location
+    coverage = score_from_buckets(wifi["counts"], wifi["power_mw"], wifi["min_signal"])
+    
+    # Track SNR if available
+    if wifi["snr_count"]:
+        coverage["avg_snr"] = round(wifi["snr_total"] / wifi["snr_count"], 1)
+        coverage["min_snr"] = wifi["min_snr"]
+    
+    # Band usage analysis
+    if wifi["band_counts"]:
+        coverage["band_usage"] = dict(wifi["band_counts"])
+    
+    coverage["dead_zone_events"] = wifi["dead_zone_events"]
+    
+    # AP visibility from this location
+    visible_aps = stream_scan_stats(h)
+    if visible_aps:
+        ap_summary = {}
+        for ap, (total, count, max_sig, min_sig) in visible_aps.items():
+            ap_summary[ap] = {
+                "avg_signal": round(total / count, 1),
+                "max_signal": max_sig,
+                "min_signal": min_sig
+            }
+        coverage["visible_aps"] = ap_summary
+            
+        # Identify best potential AP for this location
+        best_ap = max(ap_summary.items(), key=lambda x: x[1]["avg_signal"]) if ap_summary else None
+        if best_ap:
+            coverage["best_ap"] = {"name": best_ap[0], **best_ap[1]}
+    
+    return coverage
+
+
+def results_cache_key(hosts: list[str]) -> str:
+    """
+    Key identifying the current analysis inputs.
+    
+    Hashes the log directory and the mtime/size of every host's input logs,
+    plus this script's own mtime so a code change invalidates old results.
+    """
+    state = [LOG_DIR, os.stat(__file__).st_mtime_ns]
+    for h in hosts:
+        for filename in LOG_FILES:
+            try:
+                st = os.stat(f"{LOG_DIR}/{h}/{filename}")
+            except OSError:
+                continue
+            state.append((h, filename, st.st_mtime_ns, st.st_size))
+    return hashlib.sha256(repr(state).encode()).hexdigest()
+
+
+def load_cached_results(key: str) -> Optional[dict]:
+    """
+    Return cached results if they were stored under key, else None.
+    
+    The cache is plain JSON, so a tampered file can't run code. Any
+    unreadable or malformed cache is treated as a miss.
+    """
+    try:
+        with open(os.path.join(CACHE_DIR, "coverage.json"), "rb") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    results = cached.get("results")
+    return results if isinstance(results, dict) else None
+
+
+def save_cached_results(key: str, results: dict):
+    """Store results under key, replacing any previous cache. Best effort."""
+    path = os.path.join(CACHE_DIR, "coverage.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"key": key, "results": results}, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def analyze_coverage_gaps(use_cache: bool = True) -> dict:
     """
     Analyze coverage data across all probes to find gaps.
     
+    With use_cache, results from a previous run are returned as-is when no
+    host's input logs have changed since (see results_cache_key).
+    
     Returns comprehensive coverage analysis.
     """
     hosts = find_all_hosts()
     if not hosts:
         return {"error": f"No hosts found in {LOG_DIR}"}
     
-    # Read WiFi probe data
-    wifi_logs = read_csv_logs("wifi_probe.csv")
-    ap_scans = read_csv_logs("ap_scan.csv")
+    cache_key = results_cache_key(hosts) if use_cache else None
+    if cache_key:
+        cached = load_cached_results(cache_key)
+        if cached is not None:
+            return cached
     
     results = {
         "hosts": {},
@@ -151,80 +462,23 @@ def analyze_coverage_gaps() -> dict:
     }
     
     host_scores = []
-    all_dead_zone_events = []
+    
+    # Optionally queue reads for every host's logs before any worker starts parsing
+    if PREFETCH_LOGS:
+        prefetch_logs(hosts, LOG_FILES)
+    
+    # Hosts are independent, so analyze them across cores
+    workers = min(len(hosts), MAX_HOST_WORKERS)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            host_results = dict(zip(hosts, ex.map(analyze_host, hosts)))
+    else:
+        host_results = {h: analyze_host(h) for h in hosts}
     
     for h in hosts:
-        host_wifi = [w for w in wifi_logs if w.get("_host") == h]
-        host_scans = [s for s in ap_scans if s.get("_host") == h]
-        
-        if not host_wifi:
-            continue
-        
-        # Extract signal measurements
-        signals = [int(w["signal_dbm"]) for w in host_wifi if w.get("signal_dbm")]
-        
-        if not signals:
+        coverage = host_results[h]
+        if coverage is None:
             continue
-        
-        # Calculate coverage score for this location
-        coverage = calculate_coverage_score(signals)
-        
-        # Track SNR if available
-        snr_values = [int(w["snr_db"]) for w in host_wifi if w.get("snr_db")]
-        if snr_values:
-            coverage["avg_snr"] = round(mean(snr_values), 1)
-            coverage["min_snr"] = min(snr_values)
-        
-        # Band usage analysis
-        bands = [w.get("band") for w in host_wifi if w.get("band")]
-        if bands:
-            band_counts = defaultdict(int)
-            for b in bands:
-                band_counts[b] += 1
-            coverage["band_usage"] = dict(band_counts)
-        
-        # Identify dead zone events
-        dead_events = []
-        for w in host_wifi:
-            signal = int(w.get("signal_dbm") or -100)
-            if signal < DEAD_ZONE_THRESHOLD:
-                dead_events.append({
-                    "ts": w.get("ts"),
-                    "signal": signal,
-                    "ap": w.get("ap_name") or w.get("bssid"),
-                    "band": w.get("band", "")
-                })
-                all_dead_zone_events.append({
-                    "host": h,
-                    "ts": w.get("ts"),
-                    "signal": signal
-                })
-        
-        coverage["dead_zone_events"] = len(dead_events)
-        
-        # AP visibility from this location
-        if host_scans:
-            visible_aps = defaultdict(list)
-            for s in host_scans:
-                ap = s.get("ap_name") or s.get("bssid")
-                signal = int(s.get("signal_dbm") or -100)
-                if ap:
-                    visible_aps[ap].append(signal)
-            
-            ap_summary = {}
-            for ap, sigs in visible_aps.items():
-                ap_summary[ap] = {
-                    "avg_signal": round(mean(sigs), 1),
-                    "max_signal": max(sigs),
-                    "min_signal": min(sigs)
-                }
-            coverage["visible_aps"] = ap_summary
-            
-            # Identify best potential AP for this location
-            best_ap = max(ap_summary.items(), key=lambda x: x[1]["avg_signal"]) if ap_summary else None
-            if best_ap:
-                coverage["best_ap"] = {"name": best_ap[0], **best_ap[1]}
-        
         results["hosts"][h] = coverage
         host_scores.append(coverage["score"])
     
@@ -293,6 +547,9 @@ def analyze_coverage_gaps() -> dict:
     
     results["coverage_recommendations"] = recommendations
     
+    if cache_key:
+        save_cached_results(cache_key, results)
+    
     return results
 
 
@@ -309,12 +566,7 @@ def print_report(results: dict):
     
     # Overall summary
     overall = results["overall_score"]
-    if overall >= 75:
-        status = "✅ Good"
-    elif overall >= 50:
-        status = "⚠️  Fair"
-    else:
-        status = "❌ Poor"
+    status = REPORT_STATUSES[bisect_right(REPORT_THRESHOLDS, overall)]
     
     print(f"Overall Coverage Score: {overall}/100 ({status})")
     print()
@@ -332,12 +584,7 @@ def print_report(results: dict):
         dead = data.get("dead_zone_events", 0)
         
         # Color-code based on score
-        if score >= 75:
-            indicator = "✓"
-        elif score >= 50:
-            indicator = "!"
-        else:
-            indicator = "✗"
+        indicator = REPORT_INDICATORS[bisect_right(REPORT_THRESHOLDS, score)]
         
         print(f"{indicator} {host:<18} {score:>7.1f} {rating:<12} {avg_sig:>10.0f} dBm {dead:>10}")
     
@@ -377,34 +624,31 @@ def print_report(results: dict):
     
     # Visible APs summary
     print("\nAP Visibility Summary:")
-    all_aps = set()
+    # Per-location avg signal of each AP, grouped in one pass over the hosts
+    ap_coverage = defaultdict(list)
     for host, data in results["hosts"].items():
         visible = data.get("visible_aps", {})
-        all_aps.update(visible.keys())
+        for ap, stats in visible.items():
+            ap_coverage[ap].append(stats["avg_signal"])
     
-    if all_aps:
-        print(f"   Total APs visible across network: {len(all_aps)}")
+    if ap_coverage:
+        print(f"   Total APs visible across network: {len(ap_coverage)}")
         
         # Find APs with best/worst coverage
-        ap_coverage = defaultdict(list)
-        for host, data in results["hosts"].items():
-            visible = data.get("visible_aps", {})
-            for ap, stats in visible.items():
-                ap_coverage[ap].append(stats["avg_signal"])
-        
-        if ap_coverage:
-            print("\n   AP Signal Strength (avg across locations):")
-            for ap, signals in sorted(ap_coverage.items(), key=lambda x: mean(x[1]), reverse=True):
-                avg = mean(signals)
-                hosts_visible = len(signals)
-                print(f"      {ap}: {avg:.0f} dBm (visible at {hosts_visible} location(s))")
+        print("\n   AP Signal Strength (avg across locations):")
+        # Mean once per AP, not once per sort comparison
+        ap_means = {ap: sum(signals) / len(signals) for ap, signals in ap_coverage.items()}
+        for ap, avg in sorted(ap_means.items(), key=itemgetter(1), reverse=True):
+            hosts_visible = len(ap_coverage[ap])
+            print(f"      {ap}: {avg:.0f} dBm (visible at {hosts_visible} location(s))")
 
 
 def main():
     summary_only = "--summary" in sys.argv
     as_json = "--json" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
     
-    results = analyze_coverage_gaps()
+    results = analyze_coverage_gaps(use_cache=use_cache)
     
     if as_json:
         # Clean up for JSON output
@@ -415,7 +659,7 @@ def main():
             "weak_areas": results.get("weak_areas", []),
             "recommendations": results.get("coverage_recommendations", [])
         }
-        print(json.dumps(output, indent=2))
+        print(json_dumps_indented(output))
     elif summary_only:
         print(f"Overall Coverage Score: {results.get('overall_score', 0)}/100")
         print(f"Dead Zones: {len(results.get('dead_zones', []))}")
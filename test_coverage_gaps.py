@@ -0,0 +1,12 @@
+"""Tests for coverage_gaps.py signal scoring."""
+
+from coverage_gaps import calculate_coverage_score
+
+
+def test_avg_signal_is_power_average():
+    # -40 dBm is 1e-4 mW and -80 dBm is 1e-8 mW; their mean is ~-43 dBm, not -60
+    assert calculate_coverage_score([-40, -80])["avg_signal"] == -43.0
+
+
+def test_avg_signal_of_equal_samples():
+    assert calculate_coverage_score([-60, -60])["avg_signal"] == -60.0